@@ -6,10 +6,17 @@ Features:
 - BMR (Mifflin-St Jeor) + TDEE by activity level
 - Water intake suggestion
 - Save entries to data/health_history.csv
+
+Scripted use: save_entries(rows) appends many entries in one write. Each
+row is either a dict keyed by FIELDNAMES or a tuple of values in that order.
 """
 
 import os
+import re
+import io
 import csv
+import atexit
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 
 DATA_DIR = "data"
@@ -23,6 +30,16 @@ ACTIVITY_LEVELS = {
     "5": ("Very Active (hard exercise)", 1.9),
 }
 
+FIELDNAMES = ("timestamp", "name", "age", "gender", "height_cm", "weight_kg", "bmi", "category", "bmr", "tdee", "water_l", "activity")
+
+# Numeric input validators, checked before int()/float() conversion
+_INT_RE = re.compile(r"^-?\d+$")
+_FLOAT_RE = re.compile(r"^-?(?:\d+(?:\.\d*)?|\.\d+)$")
+
+# Append-only file descriptor plus a reusable line buffer, opened lazily on the
+# first save and reopened if the file is deleted or replaced
+_writer_state = {"fd": None, "buf": None, "writer": None}
+
 def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
@@ -32,7 +49,7 @@ def cm_to_m(cm):
 def calculate_bmi(weight_kg: float, height_m: float) -> float:
     if height_m <= 0:
         raise ValueError("Height must be > 0")
-    return weight_kg / (height_m ** 2)
+    return weight_kg / (height_m * height_m)
 
 def bmi_category(bmi: float) -> str:
     if bmi < 18.5:
@@ -44,12 +61,14 @@ def bmi_category(bmi: float) -> str:
     else:
         return "Obese"
 
-def calculate_bmr(gender: str, weight_kg: float, height_cm: float, age: int) -> float:
+def calculate_bmr_fast(weight_kg: float, height_cm: float, age: int, gender_offset: int) -> float:
     # Mifflin-St Jeor equation
-    if gender.strip().lower().startswith("m"):
-        return 10 * weight_kg + 6.25 * height_cm - 5 * age + 5
-    else:
-        return 10 * weight_kg + 6.25 * height_cm - 5 * age - 161
+    # gender_offset is +5 for male, -161 for female
+    return 10 * weight_kg + 6.25 * height_cm - 5 * age + gender_offset
+
+def calculate_bmr(gender: str, weight_kg: float, height_cm: float, age: int) -> float:
+    gender_offset = 5 if gender.strip()[:1].lower() == "m" else -161
+    return calculate_bmr_fast(weight_kg, height_cm, age, gender_offset)
 
 def tdee_from_bmr(bmr: float, activity_multiplier: float) -> float:
     return bmr * activity_multiplier
@@ -58,43 +77,97 @@ def water_intake_liters(weight_kg: float) -> float:
     # Approx 35 ml per kg
     return weight_kg * 0.035
 
-def save_entry(row: dict):
+def _csv_fd() -> int:
+    # Reuse the append descriptor while it still refers to CSV_PATH; reopen it
+    # if the file was deleted or replaced so saves don't go to an unlinked inode
+    fd = _writer_state["fd"]
+    if fd is not None:
+        try:
+            if os.stat(CSV_PATH).st_ino == os.fstat(fd).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        _close_csv_fd()
     ensure_data_dir()
-    file_exists = os.path.exists(CSV_PATH)
-    with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(row.keys()))
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    fd = _writer_state["fd"] = os.open(CSV_PATH, flags, 0o644)
+    return fd
+
+def _close_csv_fd():
+    if _writer_state["fd"] is not None:
+        os.close(_writer_state["fd"])
+        _writer_state["fd"] = None
+
+atexit.register(_close_csv_fd)
+
+def _append_rows(rows):
+    # each row holds the values in FIELDNAMES order
+    fd = _csv_fd()
+    if _writer_state["writer"] is None:
+        _writer_state["buf"] = io.StringIO()
+        _writer_state["writer"] = csv.writer(_writer_state["buf"])
+    buf = _writer_state["buf"]
+    writer = _writer_state["writer"]
+    new_file = os.fstat(fd).st_size == 0
+    if new_file:
+        writer.writerow(FIELDNAMES)
+    writer.writerows(rows)
+    data = buf.getvalue().encode("utf-8")
+    buf.seek(0)
+    buf.truncate()
+    # With O_APPEND a single complete os.write lands at the end of the file
+    # without interleaving; the loop only covers a rare short write
+    while data:
+        data = data[os.write(fd, data):]
+
+def _row_values(row) -> tuple:
+    # Dict rows are keyed by FIELDNAMES; any other row must already be in that order
+    if isinstance(row, Mapping):
+        return tuple(row[k] for k in FIELDNAMES)
+    if isinstance(row, (str, bytes)) or not isinstance(row, Sequence):
+        raise TypeError(f"Row must be a dict or a sequence, not {type(row).__name__}")
+    if len(row) != len(FIELDNAMES):
+        raise ValueError(f"Row has {len(row)} values, expected {len(FIELDNAMES)}")
+    return tuple(row)
+
+def save_entries(rows):
+    # Convert every row before writing so a bad row leaves the file untouched
+    _append_rows([_row_values(row) for row in rows])
+
+def save_entry(row):
+    save_entries([row])
     print(f"Saved to {CSV_PATH}")
 
 def prompt_float(prompt_text: str, allow_zero=False) -> float:
     while True:
-        try:
-            val = float(input(prompt_text).strip())
-            if not allow_zero and val <= 0:
-                print("Please enter a number greater than zero.")
-                continue
-            return val
-        except ValueError:
+        s = input(prompt_text).strip()
+        if not _FLOAT_RE.match(s):
             print("Invalid number. Try again.")
+            continue
+        val = float(s)
+        if not allow_zero and val <= 0:
+            print("Please enter a number greater than zero.")
+            continue
+        return val
 
 def prompt_int(prompt_text: str) -> int:
     while True:
-        try:
-            val = int(input(prompt_text).strip())
-            if val <= 0:
-                print("Please enter an integer greater than zero.")
-                continue
-            return val
-        except ValueError:
+        s = input(prompt_text).strip()
+        if not _INT_RE.match(s):
             print("Invalid integer. Try again.")
+            continue
+        val = int(s)
+        if val <= 0:
+            print("Please enter an integer greater than zero.")
+            continue
+        return val
 
 def main():
     print("🏥 Advanced Health Tracker — CLI")
     name = input("Name (optional): ").strip()
     age = prompt_int("Age (years): ")
     gender = input("Gender (Male/Female) [M/F]: ").strip() or "F"
+    gender_offset = 5 if gender[:1].lower() == "m" else -161
 
     # Height input: ask unit
     while True:
@@ -124,7 +197,7 @@ def main():
     # Calculations
     bmi = calculate_bmi(weight, height_m)
     cat = bmi_category(bmi)
-    bmr = calculate_bmr(gender, weight, height_cm, age)
+    bmr = calculate_bmr_fast(weight, height_cm, age, gender_offset)
     tdee = tdee_from_bmr(bmr, act_mul)
     water_l = water_intake_liters(weight)
 
@@ -143,20 +216,20 @@ def main():
 
     save = input("\nSave this entry to history? (y/n): ").strip().lower()
     if save == "y":
-        row = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "name": name,
-            "age": age,
-            "gender": gender,
-            "height_cm": round(height_cm, 1),
-            "weight_kg": round(weight, 1),
-            "bmi": round(bmi, 2),
-            "category": cat,
-            "bmr": round(bmr, 0),
-            "tdee": round(tdee, 0),
-            "water_l": round(water_l, 2),
-            "activity": act_label,
-        }
+        row = (
+            datetime.now().replace(microsecond=0).isoformat(sep=" "),
+            name,
+            age,
+            gender,
+            round(height_cm, 1),
+            round(weight, 1),
+            round(bmi, 2),
+            cat,
+            round(bmr, 0),
+            round(tdee, 0),
+            round(water_l, 2),
+            act_label,
+        )
         save_entry(row)
     else:
         print("Not saved. Bye!")
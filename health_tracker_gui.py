@@ -7,20 +7,45 @@ Features:
 - Save entry to data/health_history.csv
 - View history in a table
 - Optional: Show BMI trend chart if matplotlib installed
+
+History view, chart and batch helpers need numpy and pandas (see
+requirements.txt); Calculate and Save work without them. numpy, pandas and
+the optional accelerators (numba, bottleneck, numexpr) are imported only when
+first needed.
 """
 
 import os
+import re
+import io
 import csv
+import atexit
+import bisect
+import functools
+import importlib.util
+import queue
+import threading
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# numpy/pandas back the history view, chart and batch helpers; only checked
+# here, imported on first use so the calculator starts without them
+PANDAS_OK = importlib.util.find_spec("pandas") is not None
+
+# Optional matplotlib for charting; only checked here, imported on first chart
+MATPLOTLIB_OK = importlib.util.find_spec("matplotlib") is not None
 
-# Try optional matplotlib for charting
-try:
-    import matplotlib.pyplot as plt
-    MATPLOTLIB_OK = True
-except Exception:
-    MATPLOTLIB_OK = False
+# Optional numba for the batch metrics kernel; only checked here, compiled on first batch call
+NUMBA_OK = importlib.util.find_spec("numba") is not None
+
+# Optional bottleneck/numexpr for faster history aggregations; imported on first use
+BOTTLENECK_OK = importlib.util.find_spec("bottleneck") is not None
+NUMEXPR_OK = importlib.util.find_spec("numexpr") is not None
 
 DATA_DIR = "data"
 CSV_PATH = os.path.join(DATA_DIR, "health_history.csv")
@@ -32,6 +57,7 @@ ACTIVITY_LEVELS = {
     "Active (6–7 days/wk)": 1.725,
     "Very Active (hard exercise)": 1.9,
 }
+ACTIVITY_KEYS = tuple(ACTIVITY_LEVELS.keys())
 
 CATEGORIES = [
     ("Underweight", 0, 18.5),
@@ -40,6 +66,38 @@ CATEGORIES = [
     ("Obese", 30, float("inf")),
 ]
 
+# Upper bounds of every category but the last, for bisect/searchsorted lookups
+_BMI_THRESHOLDS = [hi for _, _, hi in CATEGORIES[:-1]]
+_BMI_LABELS = tuple(label for label, _, _ in CATEGORIES)
+# Values outside [_BMI_MIN, _BMI_MAX), including NaN, are "Unknown"
+_BMI_MIN = CATEGORIES[0][1]
+_BMI_MAX = CATEGORIES[-1][2]
+
+FIELDNAMES = ("timestamp", "name", "age", "gender", "height_cm", "weight_kg", "bmi", "category", "bmr", "tdee", "water_l")
+# Columns of the loaded history: CLI rows carry a trailing activity label
+HISTORY_COLUMNS = FIELDNAMES + ("activity",)
+
+# Results panel text; the optional "Name:" line is prepended by _show_results
+_RESULT_FMT = (
+    "Age: {age} years\n"
+    "Gender: {gender}\n"
+    "Height: {height_cm:.1f} cm\n"
+    "Weight: {weight:.1f} kg\n"
+    "\n"
+    "BMI: {bmi:.2f} ({cat})\n"
+    "BMR (Mifflin–St Jeor): {bmr:.0f} kcal/day\n"
+    "Estimated Daily Calories (TDEE): {tdee:.0f} kcal/day\n"
+    "Recommended Water Intake: {water_l:.2f} L/day"
+)
+
+# Numeric input validators, checked before int()/float() conversion
+_INT_RE = re.compile(r"^-?\d+$")
+_FLOAT_RE = re.compile(r"^-?(?:\d+(?:\.\d*)?|\.\d+)$")
+
+# Append-only file descriptor plus a reusable line buffer, opened lazily on the
+# first save and reopened if the file is deleted or replaced
+_writer_state = {"fd": None, "buf": None, "writer": None}
+
 def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
@@ -49,20 +107,49 @@ def cm_to_m(cm):
 def calculate_bmi(weight_kg: float, height_m: float) -> float:
     if height_m <= 0:
         raise ValueError("Height must be > 0")
-    return weight_kg / (height_m ** 2)
+    return weight_kg / (height_m * height_m)
 
 def bmi_category(bmi: float) -> str:
-    for label, lo, hi in CATEGORIES:
-        if lo <= bmi < hi:
-            return label
-    return "Unknown"
+    if not _BMI_MIN <= bmi < _BMI_MAX:
+        return "Unknown"
+    return _BMI_LABELS[bisect.bisect_right(_BMI_THRESHOLDS, bmi)]
+
+# numpy lookup tables, built on first use
+@functools.lru_cache(maxsize=None)
+def _activity_mul_arr() -> "np.ndarray":
+    import numpy as np
+    return np.array(list(ACTIVITY_LEVELS.values()), dtype=np.float64)
+
+@functools.lru_cache(maxsize=None)
+def _bmi_labels_np() -> "np.ndarray":
+    # Category labels followed by "Unknown" for out-of-range values
+    import numpy as np
+    return np.array(_BMI_LABELS + ("Unknown",))
+
+@functools.lru_cache(maxsize=None)
+def _metric_slots() -> "np.ndarray":
+    # Gufunc output dims must come from an input, so the kernel also takes a
+    # dummy array whose length is the number of metrics (bmi, bmr, tdee, water)
+    import numpy as np
+    return np.zeros(4)
+
+def bmi_categories_np(bmis) -> "np.ndarray":
+    # Vectorized bmi_category for a whole array of BMI values
+    import numpy as np
+    bmis = np.asarray(bmis, dtype=np.float64)
+    idx = np.searchsorted(_BMI_THRESHOLDS, bmis, side="right")
+    # NaN compares False, so it lands on the trailing "Unknown" label too
+    idx = np.where((bmis >= _BMI_MIN) & (bmis < _BMI_MAX), idx, len(_BMI_LABELS))
+    return _bmi_labels_np()[idx]
+
+def calculate_bmr_fast(weight_kg: float, height_cm: float, age: int, gender_offset: int) -> float:
+    # Mifflin-St Jeor
+    # gender_offset is +5 for male, -161 for female
+    return 10 * weight_kg + 6.25 * height_cm - 5 * age + gender_offset
 
 def calculate_bmr(gender: str, weight_kg: float, height_cm: float, age: int) -> float:
-    # Mifflin-St Jeor
-    if gender.strip().lower().startswith("m"):
-        return 10 * weight_kg + 6.25 * height_cm - 5 * age + 5
-    else:
-        return 10 * weight_kg + 6.25 * height_cm - 5 * age - 161
+    gender_offset = 5 if gender.strip()[:1].lower() == "m" else -161
+    return calculate_bmr_fast(weight_kg, height_cm, age, gender_offset)
 
 def tdee_from_bmr(bmr: float, activity_multiplier: float) -> float:
     return bmr * activity_multiplier
@@ -70,13 +157,221 @@ def tdee_from_bmr(bmr: float, activity_multiplier: float) -> float:
 def water_intake_liters(weight_kg: float) -> float:
     return weight_kg * 0.035
 
+def tdee_vec(bmr, activity_multiplier) -> "np.ndarray":
+    import numpy as np
+    if NUMEXPR_OK:
+        import numexpr as ne
+        return ne.evaluate("bmr * act_mul", local_dict={
+            "bmr": np.asarray(bmr, dtype=np.float64),
+            "act_mul": np.asarray(activity_multiplier, dtype=np.float64),
+        })
+    return np.multiply(bmr, activity_multiplier, dtype=np.float64)
+
+def bmi_trend(bmis, window=7) -> "np.ndarray":
+    # Moving average of BMI over the last `window` entries
+    import numpy as np
+    bmis = np.asarray(bmis, dtype=np.float64)
+    if bmis.size == 0:
+        return bmis.copy()
+    # bottleneck rejects windows longer than the series
+    window = min(window, bmis.size)
+    if BOTTLENECK_OK:
+        import bottleneck as bn
+        return bn.move_mean(bmis, window=window, min_count=1)
+    import pandas as pd
+    return pd.Series(bmis).rolling(window, min_periods=1).mean().to_numpy()
+
+def recompute_history_tdee(df) -> "np.ndarray":
+    # TDEE for every history row from its bmr and activity label (NaN if unknown)
+    import numpy as np
+    import pandas as pd
+    bmr = pd.to_numeric(df["bmr"], errors="coerce").to_numpy(dtype=np.float64)
+    return tdee_vec(bmr, _history_activity_multipliers(df))
+
+def recompute_history_metrics(df) -> "pd.DataFrame":
+    # bmi, bmr, tdee and water_l recomputed from every history row's inputs in
+    # one compute_metrics call; NaN where an input is missing or invalid
+    # (tdee also needs a known activity label)
+    import numpy as np
+    import pandas as pd
+    weight = pd.to_numeric(df["weight_kg"], errors="coerce").to_numpy(dtype=np.float64)
+    height_cm = pd.to_numeric(df["height_cm"], errors="coerce").to_numpy(dtype=np.float64)
+    # calculate_bmi raises on height <= 0; NaN just propagates
+    height_cm = np.where(height_cm > 0, height_cm, np.nan)
+    age = pd.to_numeric(df["age"], errors="coerce").to_numpy(dtype=np.float64)
+    is_male = df["gender"].astype(str).str.strip().str[:1].str.lower() == "m"
+    gender_offset = np.where(is_male, 5, -161)
+    metrics = compute_metrics(weight, height_cm, age, gender_offset, _history_activity_multipliers(df))
+    return pd.DataFrame(metrics, columns=["bmi", "bmr", "tdee", "water_l"], index=df.index)
+
+def _history_activity_multipliers(df) -> "np.ndarray":
+    # Multiplier for each row's activity label; NaN if unknown or absent
+    import numpy as np
+    import pandas as pd
+    if "activity" not in df:
+        return np.full(len(df), np.nan)
+    codes = pd.Index(ACTIVITY_KEYS).get_indexer(df["activity"])
+    return np.where(codes >= 0, _activity_mul_arr()[codes], np.nan)
+
+def _read_history() -> "pd.DataFrame":
+    # Raw history as strings; safe to call off the Tk thread. Columns are taken
+    # by position so CLI rows keep their activity label, any further trailing
+    # fields are ignored rather than dropping the row, and short rows are
+    # padded with "".
+    import pandas as pd
+    try:
+        return _read_history_columns(HISTORY_COLUMNS)
+    except pd.errors.ParserError:
+        # pandas rejects more positional columns than the widest row has,
+        # which happens when no row carries an activity label
+        df = _read_history_columns(FIELDNAMES)
+        return df.reindex(columns=HISTORY_COLUMNS, fill_value="")
+
+def _read_history_columns(columns) -> "pd.DataFrame":
+    import pandas as pd
+    return pd.read_csv(
+        CSV_PATH,
+        header=0,
+        names=columns,
+        usecols=range(len(columns)),
+        dtype=str,
+        keep_default_na=False,
+    )
+
+# Batch metrics kernel, built on the first compute_metrics call
+_metrics_state = {"kernel": None}
+
+def _make_metrics_core(cm_to_m, calculate_bmi, calculate_bmr_fast, tdee_from_bmr, water_intake_liters):
+    # One entry's bmi, bmr, tdee and water, built from the scalar formulas above
+    # (passed in so numba can substitute jitted versions)
+    def core(weight, height_cm, age, gender_offset, act_mul, slots, out):
+        bmr = calculate_bmr_fast(weight, height_cm, age, gender_offset)
+        out[0] = calculate_bmi(weight, cm_to_m(height_cm))
+        out[1] = bmr
+        out[2] = tdee_from_bmr(bmr, act_mul)
+        out[3] = water_intake_liters(weight)
+    return core
+
+def _build_metrics_kernel():
+    import numpy as np
+    funcs = (cm_to_m, calculate_bmi, calculate_bmr_fast, tdee_from_bmr, water_intake_liters)
+    if NUMBA_OK:
+        import numba
+        from numba import float64, int64
+        core = _make_metrics_core(*(numba.njit(f) for f in funcs))
+        # Scalar core with entries as the loop dimension, so target="parallel"
+        # can split the batch across threads
+        return numba.guvectorize(
+            [(float64, float64, float64, int64, float64, float64[:], float64[:])],
+            "(),(),(),(),(),(m)->(m)",
+            nopython=True,
+            target="parallel",
+        )(core)
+
+    core = _make_metrics_core(*funcs)
+
+    def kernel(weight, height_cm, age, gender_offset, act_mul, slots):
+        out = np.empty((weight.shape[0], slots.shape[0]), dtype=np.float64)
+        for i in range(weight.shape[0]):
+            core(weight[i], height_cm[i], age[i], gender_offset[i], act_mul[i], slots, out[i])
+        return out
+    return kernel
+
+def compute_metrics(weight, height_cm, age, gender_offset, act_mul) -> "np.ndarray":
+    # Batch version of the per-entry formulas: returns an (n, 4) array of
+    # bmi, bmr, tdee, water_l; gender_offset is +5/-161. Inputs broadcast
+    # against each other and scalars count as one entry, with or without numba
+    import numpy as np
+    if _metrics_state["kernel"] is None:
+        _metrics_state["kernel"] = _build_metrics_kernel()
+    args = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(weight, dtype=np.float64)),
+        np.atleast_1d(np.asarray(height_cm, dtype=np.float64)),
+        np.atleast_1d(np.asarray(age, dtype=np.float64)),
+        np.atleast_1d(np.asarray(gender_offset, dtype=np.int64)),
+        np.atleast_1d(np.asarray(act_mul, dtype=np.float64)),
+    )
+    if args[0].ndim != 1:
+        raise ValueError("compute_metrics takes scalars or 1-D arrays")
+    return _metrics_state["kernel"](*args, _metric_slots())
+
+def _csv_fd() -> int:
+    # Reuse the append descriptor while it still refers to CSV_PATH; reopen it
+    # if the file was deleted or replaced so saves don't go to an unlinked inode
+    fd = _writer_state["fd"]
+    if fd is not None:
+        try:
+            if os.stat(CSV_PATH).st_ino == os.fstat(fd).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        _close_csv_fd()
+    ensure_data_dir()
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    fd = _writer_state["fd"] = os.open(CSV_PATH, flags, 0o644)
+    return fd
+
+def _close_csv_fd():
+    if _writer_state["fd"] is not None:
+        os.close(_writer_state["fd"])
+        _writer_state["fd"] = None
+
+atexit.register(_close_csv_fd)
+
+def _history_stamp():
+    # (inode, size) of CSV_PATH, or None if it doesn't exist; a cached history
+    # is current only while this matches the stamp taken when it was built
+    try:
+        st = os.stat(CSV_PATH)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size
+
+def _append_row(row: tuple) -> int:
+    # row holds the values in FIELDNAMES order; returns the number of bytes appended
+    fd = _csv_fd()
+    if _writer_state["writer"] is None:
+        _writer_state["buf"] = io.StringIO()
+        _writer_state["writer"] = csv.writer(_writer_state["buf"])
+    buf = _writer_state["buf"]
+    writer = _writer_state["writer"]
+    if os.fstat(fd).st_size == 0:
+        writer.writerow(FIELDNAMES)
+    writer.writerow(row)
+    data = buf.getvalue().encode("utf-8")
+    buf.seek(0)
+    buf.truncate()
+    written = len(data)
+    # With O_APPEND a single complete os.write lands at the end of the file
+    # without interleaving; the loop only covers a rare short write
+    while data:
+        data = data[os.write(fd, data):]
+    return written
+
 class HealthTrackerApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("🏥 Health Tracker")
         self.geometry("760x560")
         self.resizable(False, False)
+        # Inputs and results of the last successful parse, reused by Save
+        self._last_inputs = None
+        self._last_results = None
+        # Raw (string) history table, read once and kept in sync on save, plus
+        # the _history_stamp() of the file contents it reflects
+        self._history_df = None
+        self._history_df_stamp = None
+        # Column arrays of the valid (timestamp, bmi) pairs in the history
+        self.history_ts = None
+        self.history_bmi = None
+        # Background history load: actions waiting on it, and a save counter so
+        # a load that raced with a save is discarded and retried
+        self._history_waiters = []
+        self._history_gen = 0
+        self._plt = None
+        self._q = queue.Queue()
         self._build_ui()
+        self.after(50, self._drain)
 
     def _build_ui(self):
         pad = 10
@@ -101,7 +396,11 @@ class HealthTrackerApp(tk.Tk):
         self.height_var = tk.StringVar()
         self.height_unit_var = tk.StringVar(value="cm")
         self.weight_var = tk.StringVar()
-        self.activity_var = tk.StringVar(value=list(ACTIVITY_LEVELS.keys())[1])
+        self.activity_var = tk.StringVar(value=ACTIVITY_KEYS[1])
+
+        # Mifflin-St Jeor gender offset, kept in sync with the Gender combobox
+        self._gender_offset = -161
+        self.gender_var.trace_add("write", self._on_gender_change)
 
         # Form layout
         r = 0
@@ -129,7 +428,7 @@ class HealthTrackerApp(tk.Tk):
         r += 1
 
         ttk.Label(form, text="Activity Level").grid(row=r, column=0, sticky="w")
-        ttk.Combobox(form, textvariable=self.activity_var, values=list(ACTIVITY_LEVELS.keys()), state="readonly", width=28).grid(row=r, column=1, sticky="w")
+        ttk.Combobox(form, textvariable=self.activity_var, values=ACTIVITY_KEYS, state="readonly", width=28).grid(row=r, column=1, sticky="w")
         r += 1
 
         btn_frame = ttk.Frame(form)
@@ -150,16 +449,19 @@ class HealthTrackerApp(tk.Tk):
         self.status = ttk.Label(self, text="Fill the form and click Calculate.", anchor="w")
         self.status.pack(fill="x", padx=pad, pady=(0,8))
 
+    def _on_gender_change(self, *_):
+        self._gender_offset = 5 if self.gender_var.get() == "Male" else -161
+
     def _parse_inputs(self):
-        try:
-            age = int(self.age_var.get())
-        except Exception:
+        age_s = self.age_var.get().strip()
+        if not _INT_RE.match(age_s):
             raise ValueError("Enter valid integer for Age.")
+        age = int(age_s)
 
-        try:
-            height_val = float(self.height_var.get())
-        except Exception:
+        height_s = self.height_var.get().strip()
+        if not _FLOAT_RE.match(height_s):
             raise ValueError("Enter valid number for Height.")
+        height_val = float(height_s)
 
         unit = self.height_unit_var.get()
         if unit == "cm":
@@ -169,53 +471,62 @@ class HealthTrackerApp(tk.Tk):
             height_m = height_val
             height_cm = height_val * 100
 
-        try:
-            weight = float(self.weight_var.get())
-        except Exception:
+        weight_s = self.weight_var.get().strip()
+        if not _FLOAT_RE.match(weight_s):
             raise ValueError("Enter valid number for Weight.")
+        weight = float(weight_s)
 
         gender = self.gender_var.get()
+        gender_offset = self._gender_offset
         activity_multiplier = ACTIVITY_LEVELS[self.activity_var.get()]
         name = self.name_var.get().strip()
 
         if age <= 0 or height_m <= 0 or weight <= 0:
             raise ValueError("Age, Height and Weight must be > 0")
 
-        return name, age, gender, height_m, height_cm, weight, activity_multiplier
+        return name, age, gender, gender_offset, height_m, height_cm, weight, activity_multiplier
+
+    def _parsed_and_computed(self):
+        key = (
+            self.name_var.get(),
+            self.age_var.get(),
+            self.gender_var.get(),
+            self.height_var.get(),
+            self.height_unit_var.get(),
+            self.weight_var.get(),
+            self.activity_var.get(),
+        )
+        if key == self._last_inputs:
+            return self._last_results
+
+        name, age, gender, gender_offset, height_m, height_cm, weight, activity = self._parse_inputs()
+        bmi = calculate_bmi(weight, height_m)
+        bmr = calculate_bmr_fast(weight, height_cm, age, gender_offset)
+        tdee = tdee_from_bmr(bmr, activity)
+        water_l = water_intake_liters(weight)
+        cat = bmi_category(bmi)
+
+        self._last_inputs = key
+        self._last_results = (name, age, gender, height_cm, weight, bmi, cat, bmr, tdee, water_l)
+        return self._last_results
 
     def on_calculate(self):
         try:
-            name, age, gender, height_m, height_cm, weight, activity = self._parse_inputs()
+            name, age, gender, height_cm, weight, bmi, cat, bmr, tdee, water_l = self._parsed_and_computed()
         except Exception as e:
             messagebox.showerror("Invalid Input", str(e))
             return
 
-        bmi = calculate_bmi(weight, height_m)
-        cat = bmi_category(bmi)
-        bmr = calculate_bmr(gender, weight, height_cm, age)
-        tdee = tdee_from_bmr(bmr, activity)
-        water_l = water_intake_liters(weight)
-
         self._show_results(name, age, gender, height_cm, weight, bmi, cat, bmr, tdee, water_l)
         self.status.config(text="Calculated. Click Save Entry to save.")
 
     def _show_results(self, name, age, gender, height_cm, weight, bmi, cat, bmr, tdee, water_l):
-        self.result_text.delete("1.0", "end")
-        lines = []
-        if name:
-            lines.append(f"Name: {name}")
-        lines.extend([
-            f"Age: {age} years",
-            f"Gender: {gender}",
-            f"Height: {height_cm:.1f} cm",
-            f"Weight: {weight:.1f} kg",
-            "",
-            f"BMI: {bmi:.2f} ({cat})",
-            f"BMR (Mifflin–St Jeor): {bmr:.0f} kcal/day",
-            f"Estimated Daily Calories (TDEE): {tdee:.0f} kcal/day",
-            f"Recommended Water Intake: {water_l:.2f} L/day",
-        ])
-        self.result_text.insert("1.0", "\n".join(lines))
+        txt = (f"Name: {name}\n" if name else "") + _RESULT_FMT.format(
+            age=age, gender=gender, height_cm=height_cm, weight=weight,
+            bmi=bmi, cat=cat, bmr=bmr, tdee=tdee, water_l=water_l,
+        )
+        # Single Tcl call instead of delete + insert
+        self.result_text.replace("1.0", "end", txt)
 
     def on_clear(self):
         self.name_var.set("")
@@ -224,94 +535,187 @@ class HealthTrackerApp(tk.Tk):
         self.height_var.set("")
         self.height_unit_var.set("cm")
         self.weight_var.set("")
-        self.activity_var.set(list(ACTIVITY_LEVELS.keys())[1])
+        self.activity_var.set(ACTIVITY_KEYS[1])
         self.result_text.delete("1.0", "end")
         self.status.config(text="Cleared.")
 
     def on_save(self):
-        ensure_data_dir()
         try:
-            name, age, gender, height_m, height_cm, weight, activity = self._parse_inputs()
+            name, age, gender, height_cm, weight, bmi, cat, bmr, tdee, water_l = self._parsed_and_computed()
         except Exception as e:
             messagebox.showerror("Invalid Input", str(e))
             return
 
-        bmi = calculate_bmi(weight, height_m)
-        cat = bmi_category(bmi)
-        bmr = calculate_bmr(gender, weight, height_cm, age)
-        tdee = tdee_from_bmr(bmr, activity)
-        water_l = water_intake_liters(weight)
-
-        row = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "name": name,
-            "age": age,
-            "gender": gender,
-            "height_cm": round(height_cm, 1),
-            "weight_kg": round(weight, 1),
-            "bmi": round(bmi, 2),
-            "category": cat,
-            "bmr": round(bmr, 0),
-            "tdee": round(tdee, 0),
-            "water_l": round(water_l, 2),
-        }
-
-        file_exists = os.path.exists(CSV_PATH)
-        with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=list(row.keys()))
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(row)
+        row = (
+            datetime.now().replace(microsecond=0).isoformat(sep=" "),
+            name,
+            age,
+            gender,
+            round(height_cm, 1),
+            round(weight, 1),
+            round(bmi, 2),
+            cat,
+            round(bmr, 0),
+            round(tdee, 0),
+            round(water_l, 2),
+        )
+
+        self._drop_stale_history()
+        written = _append_row(row)
+        self._history_gen += 1
+        if self._history_df is not None:
+            # The stamp matched just before the append, so only our row is new;
+            # a concurrent writer makes the next stamp check fail instead
+            ino, size = self._history_df_stamp
+            self._history_df_stamp = (ino, size + written)
+            import pandas as pd
+            new_row = pd.DataFrame([row], columns=FIELDNAMES).astype(str).reindex(columns=HISTORY_COLUMNS, fill_value="")
+            self._history_df = pd.concat([self._history_df, new_row], ignore_index=True)
+            self._refresh_history_arrays()
 
         messagebox.showinfo("Saved", f"Entry saved to {CSV_PATH}")
         self.status.config(text=f"Saved to {CSV_PATH}")
 
+    def _with_history(self, action):
+        # Run action once the history is loaded, reading it on a worker thread if needed
+        if not PANDAS_OK:
+            messagebox.showerror("Pandas Missing", "pandas not installed. Install via 'pip install pandas'.")
+            return
+        self._drop_stale_history()
+        if self._history_df is not None:
+            action()
+            return
+        self._history_waiters.append(action)
+        if len(self._history_waiters) == 1:
+            self.status.config(text="Loading history...")
+            self._start_history_load()
+
+    def _drop_stale_history(self):
+        # Forget the cache if the CSV was appended to by someone else (e.g. the
+        # CLI), replaced or deleted since it was built
+        if self._history_df is not None and _history_stamp() != self._history_df_stamp:
+            self._history_df = None
+
+    def _start_history_load(self):
+        threading.Thread(target=self._load_history_bg, args=(self._history_gen,), daemon=True).start()
+
+    def _load_history_bg(self, gen):
+        try:
+            # Stamp before reading: a write landing mid-read then shows up as
+            # a stamp mismatch on the next check rather than being missed
+            stamp = _history_stamp()
+            self._q.put(("history_loaded", (gen, stamp, _read_history())))
+        except Exception as e:
+            self._q.put(("history_failed", e))
+
+    def _drain(self):
+        # Reschedule no matter what, so one failure can't stop the polling loop
+        try:
+            while True:
+                try:
+                    kind, payload = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "history_loaded":
+                    gen, stamp, df = payload
+                    if gen != self._history_gen:
+                        self._start_history_load()
+                        continue
+                    try:
+                        self._history_df = df
+                        self._history_df_stamp = stamp
+                        self._refresh_history_arrays()
+                    except Exception as e:
+                        self._history_df = None
+                        self._history_failed(e)
+                        continue
+                    self.status.config(text="History loaded.")
+                    waiters, self._history_waiters = self._history_waiters, []
+                    for action in waiters:
+                        self._run_guarded(action)
+                elif kind == "history_failed":
+                    self._history_failed(payload)
+        finally:
+            self.after(50, self._drain)
+
+    def _history_failed(self, error):
+        self._history_waiters = []
+        self.status.config(text="Could not load history.")
+        messagebox.showerror("History Error", f"Could not read {CSV_PATH}: {error}")
+
+    def _run_guarded(self, action):
+        # A failing action must not skip the remaining waiters
+        try:
+            action()
+        except Exception as e:
+            self.status.config(text="Action failed.")
+            messagebox.showerror("Error", str(e))
+
+    def _refresh_history_arrays(self):
+        import numpy as np
+        import pandas as pd
+        df = self._history_df
+        ts = pd.to_datetime(df["timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce").to_numpy(dtype="datetime64[s]")
+        bmi = pd.to_numeric(df["bmi"], errors="coerce").to_numpy(dtype=np.float64)
+        valid = ~np.isnat(ts) & ~np.isnan(bmi)
+        self.history_ts = ts[valid]
+        self.history_bmi = bmi[valid]
+
     def on_view_history(self):
         if not os.path.exists(CSV_PATH):
             messagebox.showinfo("No Data", "No history yet. Save an entry first.")
             return
+        self._with_history(self._show_history_window)
 
+    def _show_history_window(self):
         win = tk.Toplevel(self)
         win.title("History")
         win.geometry("900x360")
 
-        cols = ["timestamp", "name", "age", "gender", "height_cm", "weight_kg", "bmi", "category", "bmr", "tdee", "water_l"]
+        cols = FIELDNAMES
         tree = ttk.Treeview(win, columns=cols, show="headings")
         for c in cols:
             tree.heading(c, text=c)
             tree.column(c, width=100, anchor="center")
+        tree.configure(displaycolumns=cols)
         tree.pack(fill="both", expand=True)
 
-        with open(CSV_PATH, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                tree.insert("", "end", values=[r.get(c, "") for c in cols])
+        rows = list(self._history_df[list(cols)].itertuples(index=False, name=None))
+        self._insert_rows(tree, rows, 0)
 
-    def on_show_chart(self):
-        if not MATPLOTLIB_OK:
-            messagebox.showerror("Matplotlib Missing", "Matplotlib not installed. Install via 'pip install matplotlib'.")
+    def _insert_rows(self, tree, rows, start, batch=500):
+        # Insert in chunks so large histories don't freeze the event loop
+        if not tree.winfo_exists():
             return
+        end = start + batch
+        for row in rows[start:end]:
+            tree.insert("", "end", values=row)
+        if end < len(rows):
+            self.after_idle(self._insert_rows, tree, rows, end, batch)
+
+    def on_show_chart(self):
+        if self._plt is None:
+            try:
+                import matplotlib.pyplot as plt
+            except Exception:
+                messagebox.showerror("Matplotlib Missing", "Matplotlib not installed. Install via 'pip install matplotlib'.")
+                return
+            self._plt = plt
         if not os.path.exists(CSV_PATH):
             messagebox.showinfo("No Data", "No history yet. Save an entry first.")
             return
+        self._with_history(self._plot_bmi_chart)
 
-        timestamps = []
-        bmis = []
-        with open(CSV_PATH, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                try:
-                    timestamps.append(datetime.strptime(r["timestamp"], "%Y-%m-%d %H:%M:%S"))
-                    bmis.append(float(r["bmi"]))
-                except Exception:
-                    pass
-
-        if not timestamps:
+    def _plot_bmi_chart(self):
+        plt = self._plt
+        if self.history_bmi.size == 0:
             messagebox.showinfo("No Data", "No valid entries to plot.")
             return
 
         plt.figure()
-        plt.plot(timestamps, bmis, marker="o")
+        plt.plot(self.history_ts, self.history_bmi, marker="o", label="BMI")
+        plt.plot(self.history_ts, bmi_trend(self.history_bmi), linestyle="--", label="7-entry average")
+        plt.legend()
         plt.title("BMI Trend Over Time")
         plt.xlabel("Date")
         plt.ylabel("BMI")
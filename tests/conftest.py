@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import health_tracker_cli as cli
+import health_tracker_gui as gui
+
+
+@pytest.fixture
+def csv_path(monkeypatch, tmp_path):
+    # Point both front ends at a fresh history file with no open descriptor
+    path = str(tmp_path / "health_history.csv")
+    for mod in (cli, gui):
+        monkeypatch.setattr(mod, "DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(mod, "CSV_PATH", path)
+        monkeypatch.setattr(mod, "_writer_state", dict.fromkeys(mod._writer_state))
+    yield path
+    for mod in (cli, gui):
+        mod._close_csv_fd()
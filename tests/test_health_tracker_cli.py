@@ -0,0 +1,84 @@
+import csv
+import os
+
+import pytest
+
+import health_tracker_cli as cli
+
+
+ROW = ("2025-09-08 10:00:00", "Sam", 30, "M", 180.0, 80.0, 24.69, "Normal weight",
+       1780.0, 2759.0, 2.8, "Moderate (3–5 days/wk)")
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_save_entries_accepts_dicts_and_tuples(csv_path):
+    cli.save_entries([dict(zip(cli.FIELDNAMES, ROW)), ROW])
+
+    rows = _read(csv_path)
+    assert rows[0] == list(cli.FIELDNAMES)
+    assert rows[1] == rows[2] == [str(v) for v in ROW]
+
+
+def test_save_entries_rejects_malformed_rows(csv_path):
+    with pytest.raises(TypeError):
+        cli.save_entries(["not a row"])
+    with pytest.raises(ValueError):
+        cli.save_entries([ROW[:-1]])
+    with pytest.raises(KeyError):
+        cli.save_entries([{"name": "Sam"}])
+
+
+def test_save_after_history_file_removed(csv_path):
+    cli.save_entry(ROW)
+    os.remove(csv_path)
+
+    cli.save_entry(ROW)
+
+    assert _read(csv_path) == [list(cli.FIELDNAMES), [str(v) for v in ROW]]
+
+
+def test_save_after_history_file_replaced(csv_path):
+    cli.save_entry(ROW)
+    open(csv_path + ".new", "w").close()
+    os.replace(csv_path + ".new", csv_path)
+
+    cli.save_entry(ROW)
+
+    assert _read(csv_path) == [list(cli.FIELDNAMES), [str(v) for v in ROW]]
+
+
+# Each case answers the prompt with `text`, then "7" in case it is rejected
+PROMPT_CASES = [
+    (cli.prompt_int, "30", 30, None),
+    (cli.prompt_int, " 42 ", 42, None),
+    (cli.prompt_int, "-2", 7, "Please enter an integer greater than zero."),
+    (cli.prompt_int, "0", 7, "Please enter an integer greater than zero."),
+    (cli.prompt_int, "1_0", 7, "Invalid integer. Try again."),
+    (cli.prompt_int, "2.5", 7, "Invalid integer. Try again."),
+    (cli.prompt_float, "72.5", 72.5, None),
+    (cli.prompt_float, "5.", 5.0, None),
+    (cli.prompt_float, ".5", 0.5, None),
+    (cli.prompt_float, "-2", 7.0, "Please enter a number greater than zero."),
+    (cli.prompt_float, "-.5", 7.0, "Please enter a number greater than zero."),
+    (cli.prompt_float, "1e3", 7.0, "Invalid number. Try again."),
+    (cli.prompt_float, "1_0", 7.0, "Invalid number. Try again."),
+    (cli.prompt_float, "nan", 7.0, "Invalid number. Try again."),
+    (cli.prompt_float, "", 7.0, "Invalid number. Try again."),
+]
+
+
+@pytest.mark.parametrize("prompt, text, expected, message", PROMPT_CASES)
+def test_prompt_validation(monkeypatch, capsys, prompt, text, expected, message):
+    answers = iter([text, "7"])
+    monkeypatch.setattr("builtins.input", lambda _: next(answers))
+
+    assert prompt("> ") == expected
+    out = capsys.readouterr().out
+    if message is None:
+        assert out == ""
+    else:
+        assert out.strip() == message
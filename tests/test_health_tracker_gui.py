@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import health_tracker_cli as cli
+import health_tracker_gui as gui
+
+
+def test_read_history_keeps_cli_rows(csv_path):
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(gui.FIELDNAMES) + "\r\n")
+        f.write("2025-09-07 03:29:24,gui,19,Female,165.1,49.0,17.98,Underweight,1266.0,2184.0,1.72\r\n")
+        f.write("2025-09-08 10:00:00,cli,30,M,180.0,80.0,24.69,Normal weight,1780.0,2759.0,2.8,Moderate (3–5 days/wk)\r\n")
+
+    df = gui._read_history()
+
+    assert list(df.columns) == list(gui.HISTORY_COLUMNS)
+    assert list(df["name"]) == ["gui", "cli"]
+    assert list(df["bmi"]) == ["17.98", "24.69"]
+    assert list(df["activity"]) == ["", "Moderate (3–5 days/wk)"]
+
+
+def test_read_history_without_cli_rows(csv_path):
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(gui.FIELDNAMES) + "\r\n")
+        f.write("2025-09-07 03:29:24,gui,19,Female,165.1,49.0,17.98,Underweight,1266.0,2184.0,1.72\r\n")
+
+    df = gui._read_history()
+
+    assert list(df.columns) == list(gui.HISTORY_COLUMNS)
+    assert list(df["name"]) == ["gui"]
+    assert list(df["activity"]) == [""]
+
+
+def test_read_history_header_only(csv_path):
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(gui.FIELDNAMES) + "\r\n")
+
+    df = gui._read_history()
+
+    assert list(df.columns) == list(gui.HISTORY_COLUMNS)
+    assert df.empty
+
+
+def test_recompute_history_tdee_maps_activity_labels():
+    df = pd.DataFrame({
+        "bmr": ["1000", "1000", "1000", "x"],
+        "activity": ["Sedentary (little/no exercise)", "Very Active (hard exercise)", "", "Light (1–3 days/wk)"],
+    })
+
+    tdee = gui.recompute_history_tdee(df)
+
+    np.testing.assert_allclose(tdee, [1200.0, 1900.0, np.nan, np.nan])
+
+
+def test_recompute_history_tdee_without_activity_column():
+    tdee = gui.recompute_history_tdee(pd.DataFrame({"bmr": ["1000", "1500"]}))
+
+    assert tdee.shape == (2,)
+    assert np.isnan(tdee).all()
+
+
+@pytest.mark.parametrize("use_bottleneck", [True, False])
+@pytest.mark.parametrize("n", [0, 1, 3, 9])
+def test_bmi_trend_any_length(monkeypatch, use_bottleneck, n):
+    monkeypatch.setattr(gui, "BOTTLENECK_OK", use_bottleneck and gui.BOTTLENECK_OK)
+    bmis = np.arange(n, dtype=np.float64)
+
+    trend = gui.bmi_trend(bmis)
+
+    expected = pd.Series(bmis).rolling(7, min_periods=1).mean().to_numpy()
+    np.testing.assert_allclose(trend, expected)
+
+
+def test_append_row_keeps_history_stamp_in_step(csv_path):
+    row = ("2025-09-07 03:29:24", "gui", 19, "Female", 165.1, 49.0, 17.98, "Underweight", 1266.0, 2184.0, 1.72)
+
+    assert gui._history_stamp() is None
+    gui._append_row(row)
+    ino, size = gui._history_stamp()
+    assert (ino, size + gui._append_row(row)) == gui._history_stamp()
+
+    # A CLI append or a replacement changes the stamp, so a cache built
+    # from the old contents no longer matches
+    stamp = gui._history_stamp()
+    cli.save_entry(("2025-09-07 03:30:00", "cli", 30, "Male", 180.0, 80.0, 24.69, "Normal weight", 1780.0, 2759.0, 1.55, "moderate"))
+    assert gui._history_stamp() != stamp
+
+    os.remove(csv_path)
+    assert gui._history_stamp() is None
+    gui._append_row(row)
+    assert list(gui._read_history()["name"]) == ["gui"]
+
+
+CATEGORY_CASES = [
+    (0.0, "Underweight"),
+    (18.49, "Underweight"),
+    (18.5, "Normal weight"),
+    (24.99, "Normal weight"),
+    (25.0, "Overweight"),
+    (29.99, "Overweight"),
+    (30.0, "Obese"),
+    (55.0, "Obese"),
+    (-1.0, "Unknown"),
+    (float("inf"), "Unknown"),
+    (float("nan"), "Unknown"),
+]
+
+
+@pytest.mark.parametrize("bmi, expected", CATEGORY_CASES)
+def test_bmi_category(bmi, expected):
+    assert gui.bmi_category(bmi) == expected
+
+
+def test_bmi_categories_np_matches_scalar():
+    bmis = [bmi for bmi, _ in CATEGORY_CASES]
+
+    assert list(gui.bmi_categories_np(bmis)) == [expected for _, expected in CATEGORY_CASES]
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "python"])
+def metrics_backend(request, monkeypatch):
+    if request.param and not gui.NUMBA_OK:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(gui, "NUMBA_OK", request.param)
+    monkeypatch.setitem(gui._metrics_state, "kernel", None)
+
+
+def _scalar_metrics(weight, height_cm, age, gender_offset, act_mul):
+    bmr = gui.calculate_bmr_fast(weight, height_cm, age, gender_offset)
+    return [
+        gui.calculate_bmi(weight, gui.cm_to_m(height_cm)),
+        bmr,
+        gui.tdee_from_bmr(bmr, act_mul),
+        gui.water_intake_liters(weight),
+    ]
+
+
+def test_compute_metrics_matches_scalar_formulas(metrics_backend):
+    entries = [(49.0, 165.1, 19, -161, 1.725), (80.0, 180.0, 30, 5, 1.2)]
+
+    out = gui.compute_metrics(*zip(*entries))
+
+    np.testing.assert_allclose(out, [_scalar_metrics(*e) for e in entries])
+
+
+def test_compute_metrics_broadcasts_scalars(metrics_backend):
+    out = gui.compute_metrics([80.0, 70.0], [180.0, 170.0], 30, 5, 1.55)
+    single = gui.compute_metrics(80.0, 180.0, 30, 5, 1.55)
+
+    np.testing.assert_allclose(out, [_scalar_metrics(80.0, 180.0, 30, 5, 1.55),
+                                     _scalar_metrics(70.0, 170.0, 30, 5, 1.55)])
+    np.testing.assert_allclose(single, [_scalar_metrics(80.0, 180.0, 30, 5, 1.55)])
+
+
+def test_recompute_history_metrics(metrics_backend):
+    df = pd.DataFrame({
+        "age": ["30", "19", "x"],
+        "gender": ["Male", "Female", "M"],
+        "height_cm": ["180.0", "165.1", "0"],
+        "weight_kg": ["80.0", "49.0", "70"],
+        "activity": ["Sedentary (little/no exercise)", "", "Light (1–3 days/wk)"],
+    })
+
+    out = gui.recompute_history_metrics(df)
+
+    np.testing.assert_allclose(out.iloc[0], _scalar_metrics(80.0, 180.0, 30, 5, 1.2))
+    expected = _scalar_metrics(49.0, 165.1, 19, -161, 1.0)
+    np.testing.assert_allclose(out.iloc[1][["bmi", "bmr", "water_l"]], [expected[0], expected[1], expected[3]])
+    assert np.isnan(out.iloc[1]["tdee"])
+    assert out.iloc[2][["bmi", "bmr", "tdee"]].isna().all()
+    assert out.iloc[2]["water_l"] == pytest.approx(70 * 0.035)